@@ -3,12 +3,18 @@ LinkedIn Job Tracker - Web Application
 Cloud-based job tracker with LinkedIn API integration
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
 import os
+import sqlite3
+from contextlib import closing
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
 from apscheduler.schedulers.background import BackgroundScheduler
+from keywords import calculate_priority
+from http_retry import linkedin_retry
 
 app = Flask(__name__)
 
@@ -16,38 +22,142 @@ app = Flask(__name__)
 LINKEDIN_ACCESS_TOKEN = os.environ.get('LINKEDIN_ACCESS_TOKEN', '')
 LINKEDIN_API_BASE = "https://api.linkedin.com/v2"
 
-# Job storage (in production, use a database)
-jobs_data = {
-    'jobs': [],
-    'last_updated': None
-}
+# Shared HTTP session (keep-alive + connection pooling)
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=linkedin_retry()
+))
+SESSION.headers.update({
+    'Authorization': f'Bearer {LINKEDIN_ACCESS_TOKEN}',
+    'Content-Type': 'application/json'
+})
 
-# Priority keywords
-HIGH_PRIORITY_KEYWORDS = [
-    'oracle erp', 'oracle epm', 'technical sales', 'fusion', 'netsuite',
-    'manager', 'senior manager', 'pwc', 'pricewaterhousecoopers'
-]
+# Job storage (SQLite, shared by all workers)
+JOBS_DB = os.environ.get('JOBS_DB', 'jobs.db')
 
-MEDIUM_PRIORITY_KEYWORDS = [
-    'oracle cloud', 'oracle application', 'oracle consultant', 
-    'oracle developer', 'oracle hcm', 'oracle scm'
-]
+JOB_COLUMNS = ['id', 'title', 'company', 'location', 'url', 'posted_date', 'description', 'priority']
+
+# Rows per page for /api/jobs and the priority pages
+PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
 
-def calculate_priority(job_data):
-    """Calculate job priority based on keywords"""
-    title = job_data.get('title', '').lower()
-    company = job_data.get('company', '').lower()
-    combined = f"{title} {company}"
+def get_db():
+    """Open a connection to the jobs database"""
+    conn = sqlite3.connect(JOBS_DB)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_db():
+    """Create the jobs tables and indexes if they don't exist"""
+    with closing(get_db()) as conn, conn:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                url TEXT,
+                posted_date INTEGER,
+                description TEXT,
+                priority INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_priority ON jobs (priority, posted_date);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+def load_jobs(priority=None, limit=None, offset=0):
+    """Load jobs sorted by priority then newest, optionally for one priority level"""
+    query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+    params = []
     
-    for keyword in HIGH_PRIORITY_KEYWORDS:
-        if keyword in combined:
-            return 1
+    if priority is not None:
+        query += " WHERE priority = ?"
+        params.append(priority)
     
-    for keyword in MEDIUM_PRIORITY_KEYWORDS:
-        if keyword in combined:
-            return 2
+    # LIMIT -1 means no limit in SQLite
+    # Undated jobs (NULL posted_date) sort after dated ones within each priority
+    query += " ORDER BY priority, posted_date DESC NULLS LAST LIMIT ? OFFSET ?"
+    params += [limit if limit is not None else -1, offset]
     
-    return 3
+    with closing(get_db()) as conn:
+        return [dict(row) for row in conn.execute(query, params)]
+
+def count_jobs(priority=None):
+    """Count stored jobs, optionally for one priority level"""
+    with closing(get_db()) as conn:
+        if priority is None:
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE priority = ?", (priority,)).fetchone()[0]
+
+def get_last_updated():
+    """Return when jobs were last refreshed, or None"""
+    with closing(get_db()) as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        return row[0] if row else None
+
+init_db()
+
+# Search keywords
+SEARCH_KEYWORDS = [
+    'Oracle ERP',
+    'Oracle EPM', 
+    'Oracle technical sales',
+    'PwC Oracle manager',
+    'Oracle Fusion',
+    'Oracle Cloud'
+]
+
+def _fetch_one(keyword):
+    """Fetch jobs for a single search keyword; returns [] on any error"""
+    try:
+        params = {
+            'keywords': keyword,
+            'count': 25,
+            'start': 0,
+            'locationFallback': 'us:0'  # United States
+        }
+        
+        response = SESSION.get(
+            f"{LINKEDIN_API_BASE}/jobSearch",
+            params=params,
+            timeout=30
+        )
+        
+        if response.status_code != 200:
+            print(f"API error for '{keyword}': {response.status_code}")
+            return []
+        
+        data = response.json()
+        jobs = data.get('elements', [])
+        keyword_jobs = []
+        
+        for job in jobs:
+            job_data = {
+                'id': job.get('jobPostingId', ''),
+                'title': job.get('title', 'N/A'),
+                'company': job.get('companyDetails', {}).get('name', 'N/A'),
+                'location': job.get('formattedLocation', 'N/A'),
+                'url': f"https://www.linkedin.com/jobs/view/{job.get('jobPostingId', '')}",
+                'posted_date': job.get('listedAt') or None,  # epoch ms; NULL when missing
+                'description': job.get('description', {}).get('text', '')[:200],
+                'priority': 0
+            }
+            
+            combined = f"{job_data['title']} {job_data['company']}".lower()
+            job_data['priority'] = calculate_priority(combined)
+            keyword_jobs.append(job_data)
+            
+        print(f"Fetched {len(jobs)} jobs for '{keyword}'")
+        return keyword_jobs
+        
+    except Exception as e:
+        print(f"Error fetching '{keyword}': {str(e)}")
+        return []
 
 def fetch_linkedin_jobs():
     """Fetch jobs from LinkedIn API"""
@@ -55,72 +165,18 @@ def fetch_linkedin_jobs():
         print("No LinkedIn access token found")
         return []
     
-    headers = {
-        'Authorization': f'Bearer {LINKEDIN_ACCESS_TOKEN}',
-        'Content-Type': 'application/json'
-    }
-    
-    # Search keywords
-    search_keywords = [
-        'Oracle ERP',
-        'Oracle EPM', 
-        'Oracle technical sales',
-        'PwC Oracle manager',
-        'Oracle Fusion',
-        'Oracle Cloud'
-    ]
-    
     all_jobs = []
     
-    for keyword in search_keywords:
-        try:
-            params = {
-                'keywords': keyword,
-                'count': 25,
-                'start': 0,
-                'locationFallback': 'us:0'  # United States
-            }
-            
-            response = requests.get(
-                f"{LINKEDIN_API_BASE}/jobSearch",
-                headers=headers,
-                params=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                jobs = data.get('elements', [])
-                
-                for job in jobs:
-                    job_data = {
-                        'id': job.get('jobPostingId', ''),
-                        'title': job.get('title', 'N/A'),
-                        'company': job.get('companyDetails', {}).get('name', 'N/A'),
-                        'location': job.get('formattedLocation', 'N/A'),
-                        'url': f"https://www.linkedin.com/jobs/view/{job.get('jobPostingId', '')}",
-                        'posted_date': job.get('listedAt', ''),
-                        'description': job.get('description', {}).get('text', '')[:200],
-                        'priority': 0
-                    }
-                    
-                    job_data['priority'] = calculate_priority(job_data)
-                    all_jobs.append(job_data)
-                    
-                print(f"Fetched {len(jobs)} jobs for '{keyword}'")
-            else:
-                print(f"API error for '{keyword}': {response.status_code}")
-                
-        except Exception as e:
-            print(f"Error fetching '{keyword}': {str(e)}")
+    # All keyword searches run concurrently; results are collected in keyword order
+    with ThreadPoolExecutor(max_workers=len(SEARCH_KEYWORDS)) as executor:
+        for keyword_jobs in executor.map(_fetch_one, SEARCH_KEYWORDS):
+            all_jobs.extend(keyword_jobs)
     
     # Remove duplicates by job ID
-    seen_ids = set()
-    unique_jobs = []
+    jobs_by_id = {}
     for job in all_jobs:
-        if job['id'] not in seen_ids:
-            seen_ids.add(job['id'])
-            unique_jobs.append(job)
+        jobs_by_id.setdefault(job['id'], job)
+    unique_jobs = list(jobs_by_id.values())
     
     # Sort by priority
     unique_jobs.sort(key=lambda x: x['priority'])
@@ -131,24 +187,43 @@ def update_jobs():
     """Update jobs from LinkedIn API"""
     print(f"Updating jobs at {datetime.now()}")
     jobs = fetch_linkedin_jobs()
+    last_updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S CST')
     
-    jobs_data['jobs'] = jobs
-    jobs_data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S CST')
+    # Replace the stored snapshot in one transaction
+    with closing(get_db()) as conn, conn:
+        conn.execute("DELETE FROM jobs")
+        conn.executemany(
+            f"INSERT OR REPLACE INTO jobs ({', '.join(JOB_COLUMNS)}) "
+            f"VALUES ({', '.join(':' + column for column in JOB_COLUMNS)})",
+            jobs
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                     (last_updated,))
     
     print(f"Updated with {len(jobs)} jobs")
 
 @app.route('/')
 def index():
     """Main page showing all jobs"""
+    jobs = load_jobs()
     return render_template('index.html', 
-                         jobs=jobs_data['jobs'],
-                         last_updated=jobs_data['last_updated'],
-                         total_jobs=len(jobs_data['jobs']))
+                         jobs=jobs,
+                         last_updated=get_last_updated(),
+                         total_jobs=len(jobs))
 
 @app.route('/api/jobs')
 def api_jobs():
-    """API endpoint returning jobs as JSON"""
-    return jsonify(jobs_data)
+    """API endpoint returning jobs as JSON (paginated with ?limit=&offset=)"""
+    limit = min(max(request.args.get('limit', PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    
+    return jsonify({
+        'jobs': load_jobs(limit=limit, offset=offset),
+        'last_updated': get_last_updated(),
+        'total': count_jobs(),
+        'limit': limit,
+        'offset': offset
+    })
 
 @app.route('/api/refresh')
 def api_refresh():
@@ -156,28 +231,31 @@ def api_refresh():
     update_jobs()
     return jsonify({
         'status': 'success',
-        'jobs_count': len(jobs_data['jobs']),
-        'updated_at': jobs_data['last_updated']
+        'jobs_count': count_jobs(),
+        'updated_at': get_last_updated()
     })
 
 @app.route('/priority/<int:level>')
 def priority_jobs(level):
     """Filter jobs by priority level"""
-    filtered = [job for job in jobs_data['jobs'] if job['priority'] == level]
+    filtered = load_jobs(priority=level, limit=PAGE_SIZE)
     return render_template('index.html',
                          jobs=filtered,
-                         last_updated=jobs_data['last_updated'],
-                         total_jobs=len(filtered),
+                         last_updated=get_last_updated(),
+                         total_jobs=count_jobs(level),
                          filter_level=level)
 
 if __name__ == '__main__':
-    # Initial job fetch
+    # Initial job fetch (skipped when the database already has a snapshot)
     print("Starting LinkedIn Job Tracker...")
-    update_jobs()
+    if get_last_updated() is None:
+        update_jobs()
     
     # Schedule daily updates at 9 AM, 12 PM, 3 PM CST
     scheduler = BackgroundScheduler()
-    scheduler.add_job(update_jobs, 'cron', hour='9,12,15', timezone='America/Chicago')
+    scheduler.add_job(update_jobs, 'cron', hour='9,12,15', timezone='America/Chicago',
+                      id='linkedin_refresh', replace_existing=True,
+                      coalesce=True, max_instances=1)
     scheduler.start()
     
     # Run Flask app
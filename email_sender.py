@@ -5,6 +5,7 @@ Sends the LinkedIn jobs tracker spreadsheet via email
 """
 
 import os
+import sys
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -100,7 +101,11 @@ This is an automated email from your LinkedIn Job Tracker.
         print(f"Error sending email: {str(e)}")
         return False
 
-if __name__ == "__main__":
+def main():
+    """
+    Send the spreadsheet if credentials are configured
+    Returns 0 on success, 1 on failure
+    """
     print(f"LinkedIn Job Tracker - Email Sender")
     print(f"{'='*70}")
     
@@ -110,5 +115,9 @@ if __name__ == "__main__":
         print("  EMAIL_ADDRESS - Your email address")
         print("  EMAIL_PASSWORD - Your app password")
         print("  RECIPIENT_EMAIL - Where to send (optional, defaults to sender)")
-    else:
-        send_spreadsheet_email()
+        return 1
+    
+    return 0 if send_spreadsheet_email() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
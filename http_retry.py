@@ -0,0 +1,23 @@
+"""
+HTTP retry policy for LinkedIn requests
+Shared by the web app and the email parser
+"""
+
+from urllib3.util.retry import Retry
+
+# Longest Retry-After we will sleep for, in seconds
+MAX_RETRY_AFTER = 60
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After but never waits longer than MAX_RETRY_AFTER"""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+def linkedin_retry():
+    """Retry policy for requests sessions: 3 retries on 429/5xx with 0.3s backoff"""
+    return CappedRetry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                       raise_on_status=False)
@@ -0,0 +1,103 @@
+"""
+Keyword configuration and priority matching
+Shared by the web app and the email parser
+"""
+
+import json
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    # Fall back to compiled regex alternations
+    ahocorasick = None
+
+KEYWORDS_FILE = 'keywords.json'
+
+# Load keywords from external config file
+def load_keywords():
+    """Load keywords from keywords.json file"""
+    try:
+        with open(KEYWORDS_FILE, 'r') as f:
+            config = json.load(f)
+            return config.get('HIGH_PRIORITY_KEYWORDS', []), config.get('MEDIUM_PRIORITY_KEYWORDS', [])
+    except FileNotFoundError:
+        print("WARNING: keywords.json not found. Creating default file...")
+        create_default_keywords()
+        return load_keywords()
+    except json.JSONDecodeError:
+        print("ERROR: keywords.json is not valid JSON. Please fix the file.")
+        return [], []
+
+def create_default_keywords():
+    """Create default keywords.json file"""
+    default_config = {
+        "HIGH_PRIORITY_KEYWORDS": [
+            "oracle erp", "oracle epm", "technical sales", "fusion", "netsuite",
+            "manager", "senior manager", "pwc", "pricewaterhousecoopers"
+        ],
+        "MEDIUM_PRIORITY_KEYWORDS": [
+            "oracle cloud", "oracle application", "oracle consultant",
+            "oracle developer", "oracle hcm", "oracle scm"
+        ]
+    }
+    with open(KEYWORDS_FILE, 'w') as f:
+        json.dump(default_config, f, indent=4)
+    print("Created keywords.json with default keywords")
+
+def build_automaton(high_keywords, medium_keywords):
+    """Build one Aho-Corasick automaton that matches every keyword in a single pass"""
+    automaton = ahocorasick.Automaton()
+
+    # Medium first so a keyword listed in both tiers keeps the high priority
+    for keyword in medium_keywords:
+        automaton.add_word(keyword.lower(), (2, keyword))
+    for keyword in high_keywords:
+        automaton.add_word(keyword.lower(), (1, keyword))
+
+    automaton.make_automaton()
+    return automaton
+
+def build_keyword_regex(keywords):
+    """Compile keywords into one alternation regex, or None if there are none"""
+    if not keywords:
+        return None
+
+    # Longest first so overlapping keywords prefer the longer match
+    ordered = sorted((keyword.lower() for keyword in keywords), key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, ordered)))
+
+# Load keywords and build the matcher once at startup
+HIGH_PRIORITY_KEYWORDS, MEDIUM_PRIORITY_KEYWORDS = load_keywords()
+
+if ahocorasick is not None:
+    KEYWORD_AUTOMATON = build_automaton(HIGH_PRIORITY_KEYWORDS, MEDIUM_PRIORITY_KEYWORDS)
+    HIGH_RE = MEDIUM_RE = None
+else:
+    KEYWORD_AUTOMATON = None
+    HIGH_RE = build_keyword_regex(HIGH_PRIORITY_KEYWORDS)
+    MEDIUM_RE = build_keyword_regex(MEDIUM_PRIORITY_KEYWORDS)
+
+def calculate_priority(combined_lower):
+    """
+    Calculate priority score for a job's lowercased "title company" text
+    Returns 1 (high), 2 (medium) or 3 (no keyword match)
+    """
+    if KEYWORD_AUTOMATON is None:
+        if HIGH_RE is not None and HIGH_RE.search(combined_lower):
+            return 1
+        if MEDIUM_RE is not None and MEDIUM_RE.search(combined_lower):
+            return 2
+        return 3
+
+    if not len(KEYWORD_AUTOMATON):
+        return 3
+
+    best = 3
+    for _, (priority, _) in KEYWORD_AUTOMATON.iter(combined_lower):
+        if priority < best:
+            best = priority
+            if best == 1:
+                break
+
+    return best
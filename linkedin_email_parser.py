@@ -4,19 +4,27 @@ LinkedIn Job Alert Email Parser - ENHANCED VERSION
 Fetches actual job details from LinkedIn URLs
 """
 
+import asyncio
 import imaplib
 import email
 from email.header import decode_header
+from email.utils import parsedate_to_datetime
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
+from selectolax.lexbor import LexborHTMLParser
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 import os
+import sys
 import requests
+import aiohttp
+from requests.adapters import HTTPAdapter
 import time
+import threading
 import json
+from keywords import calculate_priority
+from http_retry import MAX_RETRY_AFTER, linkedin_retry
 
 # Email Configuration
 EMAIL_ACCOUNT = os.environ.get('EMAIL_ADDRESS', '')
@@ -25,104 +33,301 @@ IMAP_SERVER = os.environ.get('IMAP_SERVER', 'imap.gmail.com')
 
 EXCEL_FILE = "linkedin_jobs_tracker.xlsx"
 
-# Load keywords from external config file
-def load_keywords():
-    """Load keywords from keywords.json file"""
-    try:
-        with open('keywords.json', 'r') as f:
-            config = json.load(f)
-            return config.get('HIGH_PRIORITY_KEYWORDS', []), config.get('MEDIUM_PRIORITY_KEYWORDS', [])
-    except FileNotFoundError:
-        print("WARNING: keywords.json not found. Creating default file...")
-        create_default_keywords()
-        return load_keywords()
-    except json.JSONDecodeError:
-        print("ERROR: keywords.json is not valid JSON. Please fix the file.")
-        return [], []
-
-def create_default_keywords():
-    """Create default keywords.json file"""
-    default_config = {
-        "HIGH_PRIORITY_KEYWORDS": [
-            "oracle erp", "oracle epm", "technical sales", "fusion", "netsuite",
-            "manager", "senior manager", "pwc", "pricewaterhousecoopers"
-        ],
-        "MEDIUM_PRIORITY_KEYWORDS": [
-            "oracle cloud", "oracle application", "oracle consultant", 
-            "oracle developer", "oracle hcm", "oracle scm"
-        ]
+# Sidecar index of job URLs already in the spreadsheet
+URLS_INDEX = "existing_urls.json"
+
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Precompiled patterns
+URL_RE = re.compile(r'https://(?:www\.)?linkedin\.com/(?:comm/)?jobs/view/(\d+)', re.IGNORECASE)
+TITLE_LINKEDIN_RE = re.compile(r'\s*[-|]\s*LinkedIn.*$')
+LOC_TEXT_RE = re.compile(r'[A-Z][a-z]+,\s*[A-Z]{2}')
+
+# CSS selectors for job page fields, tried in order
+TITLE_SELECTORS = ('h1.top-card-layout__title', 'h1', 'title')
+COMPANY_SELECTORS = ('a.topcard__org-name-link', 'span.topcard__flavor', 'a[href*="/company/"]')
+LOCATION_SELECTORS = ('span.topcard__flavor--bullet',)
+
+# On-disk cache of scraped job pages, keyed by LinkedIn job ID
+HTML_CACHE_DIR = "linkedin_cache"
+HTML_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Max LinkedIn pages in flight at once
+SCRAPE_CONCURRENCY = 8
+
+# Retry policy for async page fetches (matches the requests SESSION)
+SCRAPE_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled after each attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Shared HTTP session (keep-alive + connection pooling)
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=linkedin_retry()
+))
+SESSION.headers.update(SCRAPE_HEADERS)
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket rate limiter
+    Allows bursts of up to max_tokens requests, then one request per refill_interval seconds
+    """
+
+    def __init__(self, max_tokens=5, refill_interval=1.0):
+        self.max_tokens = max_tokens
+        self.refill_interval = refill_interval
+        self._tokens = float(max_tokens)
+        self._last_refill = time.monotonic()
+        # Shared by the event loop and worker threads
+        self._lock = threading.Lock()
+
+    def _try_take(self):
+        """Take a token if one is available, otherwise return seconds until the next one"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self.max_tokens, self._tokens + elapsed / self.refill_interval)
+            self._last_refill = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) * self.refill_interval
+
+    def acquire_blocking(self):
+        """Block the calling thread until a token is available"""
+        wait = self._try_take()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._try_take()
+
+    async def acquire(self):
+        """Wait until a token is available"""
+        wait = self._try_take()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._try_take()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+def _first_text(tree, selectors):
+    """Return stripped text of the first selector (in priority order) that matches"""
+    for selector in selectors:
+        node = tree.css_first(selector)
+        if node is not None:
+            return node.text(strip=True)
+    return None
+
+def _find_text_node(tree, pattern):
+    """Return the first text node in the document matching pattern"""
+    for node in tree.root.traverse(include_text=True):
+        if node.tag == '-text' and pattern.search(node.text_content or ''):
+            return node.text_content.strip()
+    return None
+
+# One bucket for every LinkedIn page request: bursts of 5, then 1 per second
+RATE_LIMITER = TokenBucketRateLimiter(max_tokens=5, refill_interval=1.0)
+
+def parse_job_html(content, url):
+    """
+    Extract job details from a LinkedIn job page
+    """
+    tree = LexborHTMLParser(content)
+    
+    job_data = {
+        'title': 'Not found',
+        'company': 'Not found',
+        'location': 'Not found',
+        'url': url
     }
-    with open('keywords.json', 'w') as f:
-        json.dump(default_config, f, indent=4)
-    print("Created keywords.json with default keywords")
+    
+    # Extract title - multiple methods
+    title_text = _first_text(tree, TITLE_SELECTORS)
+    
+    if title_text is not None:
+        # Clean up title (remove " - LinkedIn" etc)
+        title_text = TITLE_LINKEDIN_RE.sub('', title_text)
+        job_data['title'] = title_text[:200] if title_text else 'Not found'
+    
+    # Extract company
+    company_text = _first_text(tree, COMPANY_SELECTORS)
+    
+    if company_text is not None:
+        job_data['company'] = company_text[:100] if company_text else 'Not found'
+    
+    # Extract location
+    location_text = _first_text(tree, LOCATION_SELECTORS)
+    if location_text is None:
+        location_text = _find_text_node(tree, LOC_TEXT_RE)
+    
+    if location_text is not None:
+        job_data['location'] = location_text[:100] if location_text else 'Not found'
+    
+    return job_data
 
-# Load keywords at startup
-HIGH_PRIORITY_KEYWORDS, MEDIUM_PRIORITY_KEYWORDS = load_keywords()
+def _html_cache_path(url):
+    """Return the cache file for a job URL, or None if it has no job ID"""
+    match = URL_RE.search(url)
+    if not match:
+        return None
+    return os.path.join(HTML_CACHE_DIR, f"{match.group(1)}.html")
+
+def load_cached_html(url):
+    """Return cached page HTML for url if it is younger than HTML_CACHE_TTL"""
+    path = _html_cache_path(url)
+    if path is None:
+        return None
+    
+    try:
+        if time.time() - os.path.getmtime(path) > HTML_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def save_cached_html(url, content):
+    """Store page HTML for url in the cache"""
+    path = _html_cache_path(url)
+    if path is None:
+        return
+    
+    try:
+        os.makedirs(HTML_CACHE_DIR, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"    WARNING: Could not cache page: {str(e)}")
+
+def prune_html_cache():
+    """Delete cached pages older than HTML_CACHE_TTL"""
+    if not os.path.isdir(HTML_CACHE_DIR):
+        return
+    
+    cutoff = time.time() - HTML_CACHE_TTL
+    for entry in os.scandir(HTML_CACHE_DIR):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            continue
+
+def _job_from_page(html, url, cached):
+    """Cache a freshly fetched page, parse it and log the result"""
+    if not cached:
+        save_cached_html(url, html)
+    
+    job_data = parse_job_html(html, url)
+    source = "Scraped (cached)" if cached else "Scraped"
+    print(f"    {source}: {job_data['title'][:50]} at {job_data['company'][:30]}")
+    return job_data
 
 def scrape_linkedin_job(url):
     """
     Scrape job details directly from LinkedIn URL
     """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        # Cached pages skip the network and the rate limiter
+        html = load_cached_html(url)
+        cached = html is not None
         
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            job_data = {
-                'title': 'Not found',
-                'company': 'Not found',
-                'location': 'Not found',
-                'url': url
-            }
-            
-            # Extract title - multiple methods
-            title_elem = soup.find('h1', class_=re.compile('top-card-layout__title')) or \
-                        soup.find('h1') or \
-                        soup.find('title')
-            
-            if title_elem:
-                title_text = title_elem.get_text(strip=True)
-                # Clean up title (remove " - LinkedIn" etc)
-                title_text = re.sub(r'\s*-\s*LinkedIn.*$', '', title_text)
-                title_text = re.sub(r'\s*\|\s*LinkedIn.*$', '', title_text)
-                job_data['title'] = title_text[:200] if title_text else 'Not found'
-            
-            # Extract company
-            company_elem = soup.find('a', class_=re.compile('topcard__org-name-link')) or \
-                          soup.find('span', class_=re.compile('topcard__flavor')) or \
-                          soup.find('a', href=re.compile('/company/'))
-            
-            if company_elem:
-                company_text = company_elem.get_text(strip=True)
-                job_data['company'] = company_text[:100] if company_text else 'Not found'
-            
-            # Extract location
-            location_elem = soup.find('span', class_=re.compile('topcard__flavor--bullet')) or \
-                           soup.find(text=re.compile(r'[A-Z][a-z]+,\s*[A-Z]{2}'))
+        if not cached:
+            RATE_LIMITER.acquire_blocking()
+            response = SESSION.get(url, timeout=10)
             
-            if location_elem:
-                if hasattr(location_elem, 'get_text'):
-                    location_text = location_elem.get_text(strip=True)
-                else:
-                    location_text = str(location_elem).strip()
-                job_data['location'] = location_text[:100] if location_text else 'Not found'
-            
-            print(f"    Scraped: {job_data['title'][:50]} at {job_data['company'][:30]}")
-            return job_data
-            
-        else:
-            print(f"    Failed to fetch URL (status {response.status_code})")
-            return None
+            if response.status_code != 200:
+                print(f"    Failed to fetch URL (status {response.status_code})")
+                return None
+            html = response.content
+        
+        return _job_from_page(html, url, cached)
             
     except Exception as e:
         print(f"    Error scraping URL: {str(e)}")
         return None
 
+def _retry_after_seconds(header, default):
+    """Seconds to wait from a Retry-After header (delay or HTTP date), else default"""
+    if not header:
+        return default
+    
+    try:
+        seconds = float(header)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return default
+    
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+async def _fetch_page(session, url, limiter):
+    """
+    Fetch a job page, retrying 429/5xx responses and connection errors with backoff
+    Returns the page body, or None if LinkedIn keeps refusing it
+    """
+    for attempt in range(SCRAPE_RETRIES + 1):
+        delay = RETRY_BACKOFF * 2 ** attempt
+        
+        try:
+            # Every attempt, retries included, takes a rate limiter token
+            async with limiter:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await response.read()
+                    
+                    if response.status not in RETRY_STATUSES or attempt == SCRAPE_RETRIES:
+                        print(f"    Failed to fetch URL (status {response.status}) {url[:60]}")
+                        return None
+                    
+                    delay = _retry_after_seconds(response.headers.get('Retry-After'), delay)
+                    
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == SCRAPE_RETRIES:
+                raise
+        
+        await asyncio.sleep(delay)
+
+async def scrape_one(session, url, limiter):
+    """
+    Scrape one LinkedIn job page asynchronously
+    HTML is parsed in a worker thread so the event loop keeps fetching
+    """
+    try:
+        # Cached pages skip the network and the rate limiter
+        html = load_cached_html(url)
+        cached = html is not None
+        
+        if not cached:
+            html = await _fetch_page(session, url, limiter)
+            if html is None:
+                return None
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _job_from_page, html, url, cached)
+        
+    except Exception as e:
+        print(f"    Error scraping URL {url[:60]}: {str(e)}")
+        return None
+
+def _client_session(concurrency):
+    """Create the aiohttp session used for scraping job pages"""
+    timeout = aiohttp.ClientTimeout(total=10)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    return aiohttp.ClientSession(headers=SCRAPE_HEADERS, timeout=timeout, connector=connector)
+
 def connect_to_email():
     """Connect to email account via IMAP"""
     try:
@@ -133,81 +338,119 @@ def connect_to_email():
         print(f"Error connecting to email: {str(e)}")
         return None
 
+def disconnect_from_email(mail):
+    """Log out of IMAP, ignoring errors from a connection the server already dropped"""
+    try:
+        mail.logout()
+    except (imaplib.IMAP4.error, OSError) as e:
+        print(f"Warning: error logging out of email: {str(e)}")
+
 def extract_job_urls_from_email(email_body):
     """Extract all LinkedIn job URLs from email"""
-    url_patterns = [
-        r'https://(?:www\.)?linkedin\.com/jobs/view/(\d+)',
-        r'https://(?:www\.)?linkedin\.com/comm/jobs/view/(\d+)',
-    ]
-    
     urls = set()
-    for pattern in url_patterns:
-        matches = re.findall(pattern, email_body, re.IGNORECASE)
-        for match in matches:
-            job_id = match
-            full_url = f"https://www.linkedin.com/jobs/view/{job_id}"
-            urls.add(full_url)
+    for job_id in URL_RE.findall(email_body):
+        full_url = f"https://www.linkedin.com/jobs/view/{job_id}"
+        urls.add(full_url)
     
     return list(urls)
 
-def fetch_linkedin_job_emails(mail, days_back=30):
-    """Fetch LinkedIn job alert emails from the last N days"""
+def is_recent_email(date_header, days_back):
+    """Check an email Date header against the 2026 / days_back window"""
+    try:
+        email_date = parsedate_to_datetime(date_header)
+    except (TypeError, ValueError):
+        # Missing or unparseable date - keep the email
+        return True
+    
+    # Compare in local time, like datetime.now()
+    if email_date.tzinfo is not None:
+        email_date = email_date.astimezone().replace(tzinfo=None)
+    
+    # Only 2026 emails
+    if email_date.year != 2026:
+        return False
+    
+    # Skip if older than days_back
+    return (datetime.now() - email_date).days <= days_back
+
+def iter_linkedin_job_urls(mail, days_back=30):
+    """
+    Yield LinkedIn job URLs from job alert emails in the last N days
+    URLs are yielded as each email is parsed and may repeat across emails
+    """
     try:
         mail.select('INBOX')
-        search_criteria = '(FROM "linkedin.com")'
+        # Let the server drop anything older than days_back
+        since = (datetime.now() - timedelta(days=days_back)).strftime('%d-%b-%Y')
+        search_criteria = f'(FROM "linkedin.com" SINCE {since})'
         status, messages = mail.search(None, search_criteria)
         
         if status != 'OK':
             print("No emails found")
-            return []
+            return
         
         email_ids = messages[0].split()
-        print(f"Found {len(email_ids)} LinkedIn emails total")
+        print(f"Found {len(email_ids)} LinkedIn emails in the last {days_back} days")
+        
+        if not email_ids:
+            return
         
         recent_emails = email_ids[-50:] if len(email_ids) > 50 else email_ids
         print(f"Processing last {len(recent_emails)} emails...\n")
         
-        all_urls = []
+        # Round-trip 1: only the Date headers, to drop messages before downloading bodies
+        status, header_data = mail.fetch(b','.join(recent_emails), '(BODY.PEEK[HEADER.FIELDS (DATE)])')
+        if status != 'OK':
+            print("Failed to fetch email headers")
+            return
+        
+        wanted_emails = []
         
-        for email_id in recent_emails:
+        # Response alternates (envelope, data bytes) tuples with b')' terminators
+        for part in header_data:
+            if not isinstance(part, tuple):
+                continue
+            
+            email_id = part[0].split()[0]
+            headers = email.message_from_bytes(part[1])
+            if is_recent_email(headers['Date'], days_back):
+                wanted_emails.append(email_id)
+        
+        if not wanted_emails:
+            print("No emails in the date range")
+            return
+        
+        # Round-trip 2: full messages for the survivors; BODY.PEEK[] leaves them unread
+        status, msg_data = mail.fetch(b','.join(wanted_emails), '(BODY.PEEK[])')
+        if status != 'OK':
+            print("Failed to fetch emails")
+            return
+        
+        for part in msg_data:
+            if not isinstance(part, tuple):
+                continue
+            
             try:
-                status, msg_data = mail.fetch(email_id, '(RFC822)')
-                if status != 'OK':
-                    continue
-                
-                email_body = msg_data[0][1]
-                email_message = email.message_from_bytes(email_body)
-                
-                # Get email date
-                date_tuple = email.utils.parsedate_tz(email_message['Date'])
-                if date_tuple:
-                    email_date = datetime.fromtimestamp(email.utils.mktime_tz(date_tuple))
-                    
-                    # Only 2026 emails
-                    if email_date.year != 2026:
-                        continue
-                    
-                    # Skip if older than days_back
-                    if (datetime.now() - email_date).days > days_back:
-                        continue
+                email_message = email.message_from_bytes(part[1])
                 
                 # Extract body
                 body = get_email_body(email_message)
                 
                 if body:
-                    urls = extract_job_urls_from_email(body)
-                    all_urls.extend(urls)
+                    yield from extract_job_urls_from_email(body)
                     
             except Exception as e:
                 print(f"Error processing email: {str(e)}")
                 continue
         
-        print(f"\nTotal unique job URLs found: {len(set(all_urls))}")
-        return list(set(all_urls))
-        
     except Exception as e:
         print(f"Error fetching emails: {str(e)}")
-        return []
+
+def fetch_linkedin_job_emails(mail, days_back=30):
+    """Fetch LinkedIn job alert emails from the last N days"""
+    all_urls = set(iter_linkedin_job_urls(mail, days_back))
+    print(f"\nTotal unique job URLs found: {len(all_urls)}")
+    return list(all_urls)
 
 def get_email_body(email_message):
     """Extract email body from email message"""
@@ -232,97 +475,100 @@ def get_email_body(email_message):
     
     return body
 
-def calculate_priority(job_data):
-    """Calculate priority score"""
-    title = job_data.get('title', '').lower()
-    company = job_data.get('company', '').lower()
-    combined_text = f"{title} {company}".lower()
-    
-    for keyword in HIGH_PRIORITY_KEYWORDS:
-        if keyword in combined_text:
-            return 1
-    
-    for keyword in MEDIUM_PRIORITY_KEYWORDS:
-        if keyword in combined_text:
-            return 2
-    
-    return 3
+SHEET_TITLE = "Job Postings"
+
+SPREADSHEET_HEADERS = [
+    'Priority', 'Job Title', 'Company', 'Location', 
+    'Travel Required', 'Salary/Rate', 'Job URL', 'Date Added'
+]
+
+COLUMN_WIDTHS = [10, 50, 30, 30, 15, 15, 50, 15]
+
+# Shared cell styles
+HEADER_FONT = Font(bold=True, color='FFFFFF')
+HEADER_FILL = PatternFill(start_color='0066CC', end_color='0066CC', fill_type='solid')
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+GREEN_FILL = PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid')
+YELLOW_FILL = PatternFill(start_color='FFFFE0', end_color='FFFFE0', fill_type='solid')
+BOLD = Font(bold=True)
+
+def _job_sheet(wb):
+    """Return the job postings sheet, whichever sheet the user left active"""
+    if SHEET_TITLE in wb.sheetnames:
+        return wb[SHEET_TITLE]
+    return wb.active
+
+def read_spreadsheet_urls():
+    """Read job URLs from the spreadsheet's Job URL column"""
+    # Read-only mode streams rows instead of loading the whole workbook
+    wb = load_workbook(EXCEL_FILE, read_only=True)
+    sheet = _job_sheet(wb)
+    urls = set()
+    for (url,) in sheet.iter_rows(min_row=2, min_col=7, max_col=7, values_only=True):
+        if url:
+            urls.add(url)
+    wb.close()
+    return urls
 
 def initialize_spreadsheet():
     """Create new Excel file with headers"""
     wb = Workbook()
     sheet = wb.active
-    sheet.title = "Job Postings"
+    sheet.title = SHEET_TITLE
     
-    headers = [
-        'Priority', 'Job Title', 'Company', 'Location', 
-        'Travel Required', 'Salary/Rate', 'Job URL', 'Date Added'
-    ]
-    
-    sheet.append(headers)
+    sheet.append(SPREADSHEET_HEADERS)
     
     # Header formatting
-    header_font = Font(bold=True, color='FFFFFF')
-    header_fill = PatternFill(start_color='0066CC', end_color='0066CC', fill_type='solid')
-    
-    for col in range(1, len(headers) + 1):
-        cell = sheet.cell(row=1, column=col)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+    for cell in sheet[1]:
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
     
     # Column widths
-    column_widths = [10, 50, 30, 30, 15, 15, 50, 15]
-    for i, width in enumerate(column_widths, 1):
+    for i, width in enumerate(COLUMN_WIDTHS, 1):
         sheet.column_dimensions[get_column_letter(i)].width = width
     
     sheet.freeze_panes = 'A2'
     wb.save(EXCEL_FILE)
     print(f"Created new spreadsheet: {EXCEL_FILE}")
 
-def add_jobs_to_spreadsheet(job_urls):
-    """Scrape job details and add to spreadsheet"""
-    if not os.path.exists(EXCEL_FILE):
-        initialize_spreadsheet()
-    
-    wb = load_workbook(EXCEL_FILE)
-    sheet = wb.active
-    
-    # Get existing URLs
-    existing_urls = set()
-    for row in sheet.iter_rows(min_row=2, values_only=True):
-        if row[6]:
-            existing_urls.add(row[6])
-    
-    print(f"\nExisting jobs in spreadsheet: {len(existing_urls)}")
-    print(f"\nScraping job details from LinkedIn...\n")
-    
-    new_jobs = []
+def save_existing_urls(existing_urls):
+    """Write the job URL index next to the spreadsheet"""
+    with open(URLS_INDEX, 'w') as f:
+        json.dump(sorted(existing_urls), f)
+
+def load_existing_urls():
+    """
+    Load job URLs already in the spreadsheet
+    Uses the sidecar index unless it is missing or older than the spreadsheet
+    """
+    if os.path.exists(URLS_INDEX) and os.path.getmtime(URLS_INDEX) >= os.path.getmtime(EXCEL_FILE):
+        try:
+            with open(URLS_INDEX, 'r') as f:
+                return set(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            print(f"WARNING: {URLS_INDEX} is unreadable. Rebuilding from spreadsheet...")
     
-    for i, url in enumerate(job_urls, 1):
-        if url in existing_urls:
-            print(f"{i}/{len(job_urls)}: SKIP (already exists) {url[:60]}")
-            continue
-        
-        print(f"{i}/{len(job_urls)}: Fetching {url[:60]}")
-        
-        job_data = scrape_linkedin_job(url)
-        
-        if job_data:
-            # Skip jobs with "Not specified" location
-            if job_data.get('location', '').lower() == 'not specified':
-                print(f"    SKIPPED: Location is 'Not specified'")
-                continue
-            
-            job_data['priority'] = calculate_priority(job_data)
-            new_jobs.append(job_data)
-            time.sleep(2)  # Be respectful to LinkedIn servers
+    existing_urls = read_spreadsheet_urls()
+    save_existing_urls(existing_urls)
+    return existing_urls
+
+def save_new_jobs(new_jobs, existing_urls):
+    """
+    Append scraped jobs to the spreadsheet and update the URL index
+    Other sheets and existing formatting are left as they are
+    """
+    if not new_jobs:
+        print(f"\n[SUCCESS] Added 0 new jobs to spreadsheet")
+        return 0
     
     # Sort by priority
     new_jobs.sort(key=lambda x: x['priority'])
     
     # Add to spreadsheet
     current_date = datetime.now().strftime('%Y-%m-%d')
+    wb = load_workbook(EXCEL_FILE)
+    sheet = _job_sheet(wb)
     new_count = 0
     
     for job in new_jobs:
@@ -341,45 +587,123 @@ def add_jobs_to_spreadsheet(job_urls):
         new_count += 1
         
         # Color coding
-        row_num = sheet.max_row
-        priority_cell = sheet.cell(row=row_num, column=1)
+        priority_cell = sheet.cell(row=sheet.max_row, column=1)
         
         if job['priority'] == 1:
-            priority_cell.fill = PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid')
-            priority_cell.font = Font(bold=True)
+            priority_cell.fill = GREEN_FILL
+            priority_cell.font = BOLD
         elif job['priority'] == 2:
-            priority_cell.fill = PatternFill(start_color='FFFFE0', end_color='FFFFE0', fill_type='solid')
+            priority_cell.fill = YELLOW_FILL
     
     wb.save(EXCEL_FILE)
+    
+    # Saved after the workbook so the index is never older than it
+    existing_urls.update(job['url'] for job in new_jobs)
+    save_existing_urls(existing_urls)
+    
     print(f"\n[SUCCESS] Added {new_count} new jobs to spreadsheet")
     return new_count
 
+async def _run_pipeline(job_urls, concurrency=SCRAPE_CONCURRENCY):
+    """
+    Scrape jobs for job_urls and add them to the spreadsheet
+    Returns the number of new jobs added
+    
+    Scraper tasks pull URLs from a queue and hand results to a single
+    writer task, which scores them and saves the spreadsheet once.
+    """
+    if not os.path.exists(EXCEL_FILE):
+        initialize_spreadsheet()
+    
+    existing_urls = load_existing_urls()
+    
+    print(f"\nExisting jobs in spreadsheet: {len(existing_urls)}")
+    print(f"\nScraping job details from LinkedIn...\n")
+    
+    prune_html_cache()
+    
+    loop = asyncio.get_running_loop()
+    urls_q = asyncio.Queue()
+    rows_q = asyncio.Queue()
+    
+    for url in dict.fromkeys(job_urls):
+        urls_q.put_nowait(url)
+    
+    # One stop signal per scraper, queued behind every URL
+    for _ in range(concurrency):
+        urls_q.put_nowait(None)
+    
+    async def scraper(session):
+        while (url := await urls_q.get()) is not None:
+            if url in existing_urls:
+                print(f"SKIP (already exists) {url[:60]}")
+                continue
+            
+            print(f"Fetching {url[:60]}")
+            job_data = await scrape_one(session, url, RATE_LIMITER)
+            if job_data:
+                await rows_q.put(job_data)
+    
+    async def scrapers():
+        try:
+            async with _client_session(concurrency) as session:
+                await asyncio.gather(*(scraper(session) for _ in range(concurrency)))
+        finally:
+            await rows_q.put(None)
+    
+    async def writer():
+        new_jobs = []
+        
+        while (job_data := await rows_q.get()) is not None:
+            # Skip jobs with "Not specified" location
+            if job_data.get('location', '').lower() == 'not specified':
+                print(f"    SKIPPED: Location is 'Not specified' {job_data['url'][:60]}")
+                continue
+            
+            combined = f"{job_data['title']} {job_data['company']}".lower()
+            job_data['priority'] = calculate_priority(combined)
+            new_jobs.append(job_data)
+        
+        return await loop.run_in_executor(None, save_new_jobs, new_jobs, existing_urls)
+    
+    _, new_count = await asyncio.gather(scrapers(), writer())
+    return new_count
+
+def add_jobs_to_spreadsheet(job_urls):
+    """Scrape job details and add to spreadsheet"""
+    return asyncio.run(_run_pipeline(job_urls))
+
 def main():
-    """Main execution"""
+    """
+    Main execution
+    Returns 0 on success, 1 on failure
+    """
     print(f"LinkedIn Job Alert Email Parser - ENHANCED")
     print(f"{'='*70}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
     if not EMAIL_ACCOUNT or not EMAIL_PASSWORD:
         print("ERROR: Email credentials not set")
-        return
+        return 1
     
     # Connect to email
     print(f"Connecting to {IMAP_SERVER}...")
     mail = connect_to_email()
     
     if not mail:
-        return
+        return 1
     
     print("Connected!\n")
     
-    # Fetch job URLs from emails
-    job_urls = fetch_linkedin_job_emails(mail, days_back=30)
-    mail.logout()
+    # Fetch job URLs from emails, then log out before the (slow) scrape
+    try:
+        job_urls = fetch_linkedin_job_emails(mail, days_back=30)
+    finally:
+        disconnect_from_email(mail)
     
     if not job_urls:
         print("No job URLs found in emails")
-        return
+        return 0
     
     # Scrape and add jobs
     new_count = add_jobs_to_spreadsheet(job_urls)
@@ -390,8 +714,10 @@ def main():
     print(f"- New jobs added: {new_count}")
     print(f"- Spreadsheet: {EXCEL_FILE}")
     print(f"\nPriority 1 jobs (Green) are at the top!")
-
-    input("Press Enter to exit...")
+    
+    return 0
 
 if __name__ == "__main__":
-    main()
+    exit_code = main()
+    input("Press Enter to exit...")
+    sys.exit(exit_code)
@@ -6,12 +6,11 @@ Runs at 9 AM, 12 PM, 3 PM, and 6 PM CST daily
 - Updates spreadsheet
 - Emails you the updated spreadsheet
 """
-import schedule
 import time
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import pytz
 
@@ -21,6 +20,41 @@ SCRIPT_DIR = Path(__file__).parent.absolute()
 # Central Standard Time
 CST = pytz.timezone('America/Chicago')
 
+# Hours (CST) to run at: 9 AM, 12 PM, 3 PM, 6 PM
+SCHEDULED_HOURS = [9, 12, 15, 18]
+
+# Longest single sleep, so a suspended machine resyncs with the wall clock
+MAX_SLEEP_SECONDS = 30 * 60
+
+# Max seconds to wait for each step
+PARSER_TIMEOUT = 300
+EMAIL_TIMEOUT = 60
+
+# Worker thread of the last step run; a step that timed out keeps running in it
+_last_worker = None
+
+def previous_run_active():
+    """Return True if a step that timed out in an earlier run is still working"""
+    return _last_worker is not None and not _last_worker.done()
+
+def run_with_timeout(func, timeout):
+    """
+    Run func in a worker thread and wait up to timeout seconds for its result
+    Raises concurrent.futures.TimeoutError if it takes longer
+    
+    A thread can't be killed, so a step that times out keeps running;
+    previous_run_active() reports it until it finishes.
+    """
+    global _last_worker
+    
+    executor = ThreadPoolExecutor(max_workers=1)
+    _last_worker = executor.submit(func)
+    try:
+        return _last_worker.result(timeout=timeout)
+    finally:
+        # Don't block on a step that timed out
+        executor.shutdown(wait=False)
+
 def run_parser_and_email():
     """Run the parser, then email the results"""
     current_time = datetime.now(CST).strftime('%I:%M %p CST')
@@ -29,28 +63,29 @@ def run_parser_and_email():
     print(f"LinkedIn Job Tracker - Running at {current_time}")
     print(f"{'='*70}\n")
     
+    # A timed-out parser may still be writing the spreadsheet and URL index
+    if previous_run_active():
+        print("SKIPPED: The previous run timed out and is still working")
+        return
+    
+    # Modules are imported inside the try blocks so keywords.json and the
+    # spreadsheet resolve from SCRIPT_DIR, and a missing package is reported
+    # like any other failure; after the first run they (and their HTTP
+    # sessions) stay warm
+    
     # Step 1: Parse emails and update spreadsheet
     print("Step 1: Checking email for new LinkedIn job alerts...")
     try:
-        parser_path = SCRIPT_DIR / 'linkedin_email_parser.py'
-        
-        result = subprocess.run(
-            [sys.executable, str(parser_path)],
-            capture_output=True,
-            text=True,
-            timeout=300,
-            cwd=str(SCRIPT_DIR)  # Run in the script directory
-        )
+        from linkedin_email_parser import main as parser_main
         
-        print(result.stdout)
+        exit_code = run_with_timeout(parser_main, PARSER_TIMEOUT)
         
-        if result.returncode != 0:
-            print(f"ERROR: Parser failed with code {result.returncode}")
-            print(result.stderr)
+        if exit_code != 0:
+            print(f"ERROR: Parser failed with code {exit_code}")
             return
             
-    except subprocess.TimeoutExpired:
-        print("ERROR: Parser timed out after 5 minutes")
+    except FutureTimeoutError:
+        print("ERROR: Parser timed out after 5 minutes (it keeps running in the background)")
         return
     except Exception as e:
         print(f"ERROR: {str(e)}")
@@ -59,39 +94,41 @@ def run_parser_and_email():
     # Step 2: Email the spreadsheet
     print("\nStep 2: Emailing spreadsheet to you...")
     try:
-        email_sender_path = SCRIPT_DIR / 'email_sender.py'
+        from email_sender import main as email_main
         
-        result = subprocess.run(
-            [sys.executable, str(email_sender_path)],
-            capture_output=True,
-            text=True,
-            timeout=60,
-            cwd=str(SCRIPT_DIR)  # Run in the script directory
-        )
+        exit_code = run_with_timeout(email_main, EMAIL_TIMEOUT)
         
-        print(result.stdout)
-        
-        if result.returncode != 0:
-            print(f"ERROR: Email sender failed with code {result.returncode}")
-            print(result.stderr)
+        if exit_code != 0:
+            print(f"ERROR: Email sender failed with code {exit_code}")
         else:
             print(f"\n✓ Complete! Spreadsheet emailed at {current_time}")
             
-    except subprocess.TimeoutExpired:
-        print("ERROR: Email sender timed out")
+    except FutureTimeoutError:
+        print("ERROR: Email sender timed out (it keeps running in the background)")
     except Exception as e:
         print(f"ERROR: {str(e)}")
 
+def scheduled_datetimes(now):
+    """Return today's and tomorrow's scheduled run times in CST"""
+    today = now.astimezone(CST).date()
+    run_times = []
+    for day in (today, today + timedelta(days=1)):
+        for hour in SCHEDULED_HOURS:
+            naive = datetime(day.year, day.month, day.day, hour)
+            run_times.append(CST.localize(naive))
+    return run_times
+
+def next_run_time(now):
+    """Return the next scheduled run time after now"""
+    return min(t for t in scheduled_datetimes(now) if t > now)
+
 def main():
     """Main scheduler loop"""
     
     print(f"Script directory: {SCRIPT_DIR}\n")
     
-    # Schedule for 9 AM, 12 PM, 3 PM, and 6 PM CST
-    schedule.every().day.at("09:00").do(run_parser_and_email)
-    schedule.every().day.at("12:00").do(run_parser_and_email)
-    schedule.every().day.at("15:00").do(run_parser_and_email)  # 3 PM in 24-hour format
-    schedule.every().day.at("18:00").do(run_parser_and_email)  # 6 PM in 24-hour format
+    # Parser and email sender use paths relative to the script directory
+    os.chdir(SCRIPT_DIR)
     
     print(f"LinkedIn Job Tracker - Multi-Time Scheduler")
     print(f"{'='*70}")
@@ -116,17 +153,26 @@ def main():
     current_minute = now.minute
     
     # If within 5 minutes of a scheduled time, run now
-    scheduled_hours = [9, 12, 15, 18]
-    if current_hour in scheduled_hours and current_minute < 5:
+    if current_hour in SCHEDULED_HOURS and current_minute < 5:
         print(f"\nRunning immediately (scheduled time)...")
         run_parser_and_email()
     else:
         print(f"\nWaiting for next scheduled run...")
     
-    # Main loop
+    # Main loop - sleep until the next scheduled time instead of polling
+    next_run = next_run_time(datetime.now(CST))
+    print(f"Next run: {next_run.strftime('%I:%M %p CST on %A, %B %d')}")
+    
     while True:
-        schedule.run_pending()
-        time.sleep(30)  # Check every 30 seconds
+        now = datetime.now(CST)
+        
+        if now >= next_run:
+            run_parser_and_email()
+            next_run = next_run_time(datetime.now(CST))
+            print(f"\nNext run: {next_run.strftime('%I:%M %p CST on %A, %B %d')}")
+            continue
+        
+        time.sleep(min((next_run - now).total_seconds(), MAX_SLEEP_SECONDS))
 
 if __name__ == "__main__":
     try: